@@ -95,19 +95,28 @@ def verify_root(trusted_current_root_metadata, untrusted_new_root_metadata):
             "root version may be skipped."
         )
 
+    # Both verifications below are over the same signed data, so serialize it
+    # just once.
+    signed_data = canonserialize(untrusted_new_root_metadata["signed"])
+
     # Verify the new root metadata based on the prior, trusted root version.
-    verify_signable(
-        untrusted_new_root_metadata, authorized_pub_keys, expected_threshold, gpg=True
+    _verify_signable(
+        untrusted_new_root_metadata,
+        authorized_pub_keys,
+        expected_threshold,
+        gpg=True,
+        signed_data=signed_data,
     )
 
     # Make sure that the signatures on the new root metadata would be
     # sufficient to verify it using the new root metadata's own rules as well.
     # Doing this helps avoid breaking the chain of trust.
-    verify_signable(
+    _verify_signable(
         untrusted_new_root_metadata,
         new_authorized_pub_keys,
         new_expected_threshold,
         gpg=True,
+        signed_data=signed_data,
     )
 
 
@@ -330,6 +339,20 @@ def verify_signable(signable, authorized_pub_keys, threshold, gpg=False):
             instead of raw ed25519 signatures.
             If False, expects raw ed25519 signatures.
     """
+    _verify_signable(signable, authorized_pub_keys, threshold, gpg=gpg)
+
+
+def _verify_signable(
+    signable, authorized_pub_keys, threshold, gpg=False, signed_data=None
+):
+    """
+    Implements verify_signable.
+
+    If provided, signed_data must be canonserialize(signable['signed']).
+    Callers verifying the same signable more than once (e.g. verify_root,
+    against both the old and the new root's rules) provide it so that the
+    signed portion is only serialized once.
+    """
 
     # TODO: ✅ Be sure to check with the analogous code in the tuf reference
     #       implementation in case one of us had some clever gotcha there.
@@ -376,7 +399,8 @@ def verify_signable(signable, authorized_pub_keys, threshold, gpg=False):
 
     # Put the 'signed' portion of the data into the format it should be in
     # before it is signed, so that we can verify the signatures.
-    signed_data = canonserialize(signable["signed"])
+    if signed_data is None:
+        signed_data = canonserialize(signable["signed"])
 
     # Even though we're not returning this, we produce this dictionary (instead
     # of just counting) to facilitate future checks and logging.
@@ -445,6 +469,11 @@ def verify_signable(signable, authorized_pub_keys, threshold, gpg=False):
             else:
                 good_sigs_from_trusted_keys[pubkey_hex] = signature
 
+        # Once the threshold is met, the remaining signatures cannot change
+        # the outcome, so don't spend time verifying them.
+        if len(good_sigs_from_trusted_keys) >= threshold:
+            break
+
     # TODO: ✅ Logging or more detailed info (which keys).
     if len(good_sigs_from_trusted_keys) < threshold:
         raise SignatureError(
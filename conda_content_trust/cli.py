@@ -6,24 +6,141 @@ This is intended to provide a command-line signing and metadata update
 interface.
 """
 
-from argparse import ArgumentParser
-from copy import deepcopy
+from argparse import ArgumentParser, ArgumentTypeError
+from importlib.util import find_spec
 from json import dumps
 
 import conda_content_trust.authentication
-import conda_content_trust.root_signing
 import conda_content_trust.signing
 
 from . import __version__
 from .common import (
     CCT_Error,
     PrivateKey,
+    deepcopy_json,
     is_gpg_fingerprint,
     is_hex_key,
     load_metadata_from_file,
+    normalize_hex_string,
     write_metadata_to_file,
 )
 
+# Basic text formatting string constants
+PINK = "\033[95m"
+BLUE = "\033[94m"
+CYAN = "\033[96m"
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+ENDC = "\033[0m"
+BOLD = "\033[1m"
+UNDERLINE = "\033[4m"
+
+# Complete formats
+F_LABEL = ENDC + UNDERLINE + BOLD + PINK
+F_INSTRUCT = ENDC + BOLD + PINK
+F_OPTS = ENDC + GREEN
+
+# The operations offered by interactive_modify_metadata, by number, and the
+# fixed text of its prompt.  These are assembled once, here, rather than on
+# every call (or every trip through the prompt loop).
+MODIFY_METADATA_OPTION_LABELS = (
+    "Done: write and save metadata",
+    "Abort: discard changes -- abort without writing",
+    "Add a signature (sign with a key you have)",
+    "Remove a signature",
+    "Update any top-level dictionary entry",
+    "Add a delegation",
+    "Remove a delegation",
+    "Change the threshold number of keys for a delegation",
+    "Add an authorized key to a delegation",
+    "Remove an authorized key from a delegation",
+)
+MODIFY_METADATA_OPTIONS_TEXT = (
+    F_INSTRUCT
+    + "\n--- Please choose an operation by entering its number\n"
+    + ENDC
+    + "".join(
+        "    " + F_LABEL + str(index) + ENDC + ": " + label + ENDC + "\n"
+        for index, label in enumerate(MODIFY_METADATA_OPTION_LABELS)
+    )
+)
+MODIFY_METADATA_HEADER = (
+    F_OPTS
+    + BOLD
+    + "\n\n---------------------\n--- Current metadata:\n---------------------\n"
+    + ENDC
+)
+MODIFY_METADATA_CHOICE_PROMPT = F_OPTS + "Choice: " + ENDC
+MODIFY_METADATA_INVALID_CHOICE = RED + BOLD + "\nInvalid entry.  Try again.\n" + ENDC
+# Templates (for str.format) for the messages that include varying text.
+MODIFY_METADATA_CHOSE = F_OPTS + '\nChose "{}"' + ENDC
+MODIFY_METADATA_PROMPT_FOR = F_INSTRUCT + "\n----- Please provide {}" + ENDC + ": "
+# Messages from the individual operations.
+MODIFY_METADATA_ABORTING = RED + BOLD + "\nAborting!\n" + ENDC
+MODIFY_METADATA_SIGNING_WARNING = (
+    F_OPTS
+    + "Signing.  "
+    + RED
+    + "Please ABORT (control-c) if the metadata above is not EXACTLY what you "
+    "want to sign!" + ENDC
+)
+MODIFY_METADATA_SIGNED = F_OPTS + "\n\n--- Successfully signed!  Please save." + ENDC
+MODIFY_METADATA_SIGNING_FAILED = (
+    F_OPTS
+    + "\n\n--- "
+    + RED
+    + "Signing FAILED."
+    + F_OPTS
+    + "  Do you have this key loaded in GPG on this system?"
+)
+MODIFY_METADATA_UNRECOGNIZED_KEY = (
+    F_OPTS + RED + "Unable to recognize key.  Please try again." + ENDC
+)
+MODIFY_METADATA_UNKNOWN_DELEGATION = (
+    F_OPTS + "\n\n--- " + RED + "Unable to find that delegation.  Please try "
+    "again." + ENDC
+)
+MODIFY_METADATA_INVALID_THRESHOLD = (
+    F_OPTS + "\n--- " + RED + "Invalid value.  Expecting integer greater than "
+    "or equal to 1.  Please try again." + ENDC
+)
+MODIFY_METADATA_THRESHOLD_UPDATED = (
+    F_OPTS + "\n--- Threshold successfully updated." + ENDC
+)
+
+
+def _sslib_available():
+    """
+    Reports whether securesystemslib's GPG support can be imported, without
+    importing it.
+
+    Importing securesystemslib.gpg (via the root_signing module) dominates the
+    start-up time of this CLI, so that module is only imported once a GPG
+    operation is actually requested.  Looking for the gpg subpackage imports
+    only securesystemslib's own (light) __init__, and also catches versions of
+    securesystemslib that have no securesystemslib.gpg, which root_signing
+    cannot use.
+    """
+    try:
+        return find_spec("securesystemslib.gpg") is not None
+    except ImportError:  # securesystemslib itself is missing
+        return False
+
+
+def _positive_int(value):
+    """
+    Argument type for counts that must be at least 1 (e.g. --jobs), so that
+    anything else is reported as a usage error.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
 
 def cli(args=None):
     parser = build_parser()
@@ -73,6 +190,13 @@ def build_parser():
             "to sign each artifact's metadata"
         ),
     )
+    p_signrepo.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="the number of processes to sign artifacts with (default: one per CPU)",
+    )
 
     # subcommand: verify-metadata
 
@@ -122,11 +246,16 @@ def build_parser():
         "metadata_filename",
         help="the filename of the existing metadata file to modify",
     )
+    p_modifymd.add_argument(
+        "--no-color",
+        action="store_true",
+        help="show the metadata without syntax highlighting",
+    )
 
     # If we're missing optional requirements for the next few options, note
     # that in their help strings.
     opt_reqs_str = ""
-    if not conda_content_trust.root_signing.SSLIB_AVAILABLE:
+    if not _sslib_available():
         opt_reqs_str = (
             "[Unavailable]: Requires optional "
             "dependencies: securesystemslib and gpg.  "
@@ -158,7 +287,8 @@ def build_parser():
         help=(
             opt_reqs_str + "Sign a given "
             "piece of metadata using GPG instead of the usual signing "
-            "mechanisms.  Takes an OpenPGP key fingerprint and a filename."
+            "mechanisms.  Takes an OpenPGP key fingerprint and one or more "
+            "filenames."
         ),
     )
     p_gpgsign.set_defaults(func=cli_gpg_sign)
@@ -171,23 +301,29 @@ def build_parser():
         ),
     )
     p_gpgsign.add_argument(
-        "filename", help="the filename of the file that will be signed"
+        "filenames",
+        metavar="filename",
+        nargs="+",
+        help="the filename of a file that will be signed",
     )
 
     return parser
 
 
 def cli_gpg_sign(args):
+    from . import root_signing
+
     # TODO: Validate arguments.
 
     # Strip any whitespace from the key fingerprint and lowercase it.
     # GPG pops out keys in a variety of whitespace arrangements and cases,
     # so this is necessary for convenience.
-    gpg_key_fingerprint = "".join(args.gpg_key_fingerprint.split()).lower()
+    gpg_key_fingerprint = normalize_hex_string(args.gpg_key_fingerprint)
 
-    conda_content_trust.root_signing.sign_root_metadata_via_gpg(
-        args.filename, gpg_key_fingerprint
-    )
+    # Signing several files in one go spares running this command (and
+    # looking the key up in GPG) once per file.
+    for filename in args.filenames:
+        root_signing.sign_root_metadata_via_gpg(filename, gpg_key_fingerprint)
 
 
 def cli_sign_artifacts(args):
@@ -204,13 +340,15 @@ def cli_sign_artifacts(args):
         return
 
     conda_content_trust.signing.sign_all_in_repodata(
-        args.repodata_fname, private_key_hex
+        args.repodata_fname, private_key_hex, args.jobs
     )
 
 
 def cli_gpg_key_lookup(args):
-    gpg_key_fingerprint = "".join(args.gpg_key_fingerprint.split()).lower()
-    keyval = conda_content_trust.root_signing.fetch_keyval_from_gpg(gpg_key_fingerprint)
+    from . import root_signing
+
+    gpg_key_fingerprint = normalize_hex_string(args.gpg_key_fingerprint)
+    keyval = root_signing.fetch_keyval_from_gpg(gpg_key_fingerprint)
     print("Underlying ed25519 public key value: " + str(keyval))
 
 
@@ -245,32 +383,34 @@ def cli_verify_metadata(args):
 
     if metadata_type == "root":
         # Verifying root has additional steps beyond verify_delegation.
-        try:
+        def verify():
             conda_content_trust.authentication.verify_root(
                 trusted_metadata, untrusted_metadata
             )
-            print("Root metadata verification successful.")
-            return 0  # success
 
-        except CCT_Error as e:
-            errorcode = 10
-            errorstring = str(e)
+        success_message = "Root metadata verification successful."
+        errorcode = 10
 
     else:
         # Verifying anything other than root just uses verify_delegation
         # directly.
-        try:
+        def verify():
             conda_content_trust.authentication.verify_delegation(
                 delegation_name=metadata_type,
                 untrusted_delegated_metadata=untrusted_metadata,
                 trusted_delegating_metadata=trusted_metadata,
             )
-            print("Metadata verification successful.")
-            return 0  # success
 
-        except CCT_Error as e:
-            errorcode = 20
-            errorstring = str(e)
+        success_message = "Metadata verification successful."
+        errorcode = 20
+
+    try:
+        verify()
+    except CCT_Error as e:
+        errorstring = str(e)
+    else:
+        print(success_message)
+        return 0  # success
 
     # We should only get here if verification failed.
     print(
@@ -305,10 +445,10 @@ def cli_modify_metadata(args):
     # if new_metadata is not None and new_metadata:
     #     write_metadata_to_file(new_metadata, args.metadata_filename)
 
-    interactive_modify_metadata(old_metadata)
+    interactive_modify_metadata(old_metadata, color=not args.no_color)
 
 
-def interactive_modify_metadata(metadata):
+def interactive_modify_metadata(metadata, color=True):
     """ """
 
     # Update version if there is a version.
@@ -334,222 +474,200 @@ def interactive_modify_metadata(metadata):
     #     prepend "<version>." to root.json file.
 
     initial_metadata = metadata
-    metadata = deepcopy(initial_metadata)
+    metadata = deepcopy_json(initial_metadata)
 
     import pprint
 
-    try:
-        import pygments
-        import pygments.formatters
-        import pygments.lexers
-    except ImportError:
-        print(
-            "interactive modify-metadata mode employs pygments for syntax "
-            "highlighting, if pygments is available.  pygments was not "
-            "found, so the JSON contents will be... uglier than they "
-            "would otherwise be.  If you would like syntax highlighting "
-            "and prettier printing of JSON, you may install pygments."
-        )
-        pygments = None
-
-    # Build the modification options and prompt.
-    def promptfor(s):
-        return input(F_INSTRUCT + "\n----- Please provide " + s + ENDC + ": ")
-
-    def fn_write():
-        fname = promptfor("a filename to save this metadata as")
-        print("Writing to file....")
-        write_metadata_to_file(metadata, fname)
-        print("Modified metadata written!")
-        return 1
-
-    def fn_abort():
-        # TODO✅: Ask to confirm.
-        print(RED + BOLD + "\nAborting!\n" + ENDC)
-        return 1
-
-    def fn_addsig():
-        if not conda_content_trust.root_signing.SSLIB_AVAILABLE:
+    pygments = None
+    if color:
+        try:
+            import pygments
+            import pygments.formatters
+            import pygments.lexers
+        except ImportError:
             print(
-                F_OPTS + "Signing.  " + RED + "Please ABORT (control-c) if "
-                "the metadata above is not EXACTLY what you want to sign!" + ENDC
+                "interactive modify-metadata mode employs pygments for syntax "
+                "highlighting, if pygments is available.  pygments was not "
+                "found, so the JSON contents will be... uglier than they "
+                "would otherwise be.  If you would like syntax highlighting "
+                "and prettier printing of JSON, you may install pygments."
             )
-        key = promptfor(
-            "a key: either:\n     - a 40-character-hex-string GPG PUBLIC "
-            "key fingerprint\n"
-            "       for GPG keys (e.g. root YubiKeys), or \n     - a "
-            "64-character-hex-string PRIVATE key value for normal "
-            "keys.\n\n     Whitespace will be removed and characters will "
-            "be lowercased.\n     Key"
-        )
-        key = "".join(key.split()).lower()
+            pygments = None
 
-        if is_hex_key(key):
-            private_key = PrivateKey.from_hex(key)
-            conda_content_trust.signing.sign_signable(metadata, private_key)
-            print(F_OPTS + "\n\n--- Successfully signed!  Please save." + ENDC)
+    if pygments is not None:
+        lexer = pygments.lexers.JsonLexer()
+        formatter = pygments.formatters.TerminalFormatter()
 
-        elif is_gpg_fingerprint(key):
-            try:
-                conda_content_trust.root_signing.sign_root_metadata_dict_via_gpg(
-                    metadata, key
-                )
-            except (ValueError, TypeError, ImportError):
-                print(
-                    F_OPTS
-                    + "\n\n--- "
-                    + RED
-                    + "Signing FAILED."
-                    + F_OPTS
-                    + "  Do you have this key loaded in GPG on "
-                    "this system?"
-                )
-            else:
-                print(F_OPTS + "\n\n--- Successfully signed!  Please save." + ENDC)
+    # Highlighting is slow for large metadata, and most trips through the
+    # loop (e.g. invalid entries) leave the metadata unchanged, so only
+    # re-highlight when the formatted metadata differs from last time.
+    formatted_metadata = highlighted_metadata = None
+
+    done = False
+    while not done:
+        print(MODIFY_METADATA_HEADER)
 
+        if pygments is not None:
+            new_formatted_metadata = dumps(metadata, sort_keys=True, indent=4)
+            if new_formatted_metadata != formatted_metadata:
+                formatted_metadata = new_formatted_metadata
+                highlighted_metadata = pygments.highlight(
+                    formatted_metadata.encode("utf-8"), lexer, formatter
+                )
+            print(highlighted_metadata)
+        elif color:
+            pprint.pprint(metadata)
         else:
-            print(F_OPTS + RED + "Unable to recognize key.  Please try again." + ENDC)
-        return 0
+            print(dumps(metadata, sort_keys=True, indent=4))
 
-    def fn_remsig():
-        return 0
+        print(MODIFY_METADATA_OPTIONS_TEXT)
+        option = MODIFY_METADATA_OPTIONS.get(
+            input(MODIFY_METADATA_CHOICE_PROMPT).strip()
+        )
+        if option is None:
+            print(MODIFY_METADATA_INVALID_CHOICE)
+            continue
 
-    def fn_update():
-        return 0
+        fn, label = option
+        print(MODIFY_METADATA_CHOSE.format(label))
 
-    def fn_adddel():
-        return 0
+        done = fn(metadata)  # Run the func associated with the option.
 
-    def fn_remdel():
-        return 0
+    # Pull modified from debugging script
+    # Pull modified from debugging script
+    # Pull modified from debugging script
 
-    def fn_thresh():
-        delegation = promptfor(
-            "a delegation name (one of the entries in the"
-            '\n     "delegations" dictionary in the metadata above).  '
-            "This will\n     be the delegation whose threshold number of "
-            "required keys we\n     will change."
-        )
-        if delegation not in metadata["signed"]["delegations"]:
-            print(
-                F_OPTS + "\n\n--- " + RED + "Unable to find that delegation."
-                "  Please try again." + ENDC
-            )
-            return 0
 
-        new_thresh = promptfor(
-            "a new threshold value.  The current value is "
-            + str(metadata["signed"]["delegations"][delegation]["threshold"])
-        )
+def _promptfor(s):
+    return input(MODIFY_METADATA_PROMPT_FOR.format(s))
+
+
+def _modify_write(metadata):
+    fname = _promptfor("a filename to save this metadata as")
+    print("Writing to file....")
+    write_metadata_to_file(metadata, fname)
+    print("Modified metadata written!")
+    return 1
 
+
+def _modify_abort(metadata):
+    # TODO✅: Ask to confirm.
+    print(MODIFY_METADATA_ABORTING)
+    return 1
+
+
+def _modify_addsig(metadata):
+    from . import root_signing
+
+    if not root_signing.SSLIB_AVAILABLE:
+        print(MODIFY_METADATA_SIGNING_WARNING)
+    key = _promptfor(
+        "a key: either:\n     - a 40-character-hex-string GPG PUBLIC "
+        "key fingerprint\n"
+        "       for GPG keys (e.g. root YubiKeys), or \n     - a "
+        "64-character-hex-string PRIVATE key value for normal "
+        "keys.\n\n     Whitespace will be removed and characters will "
+        "be lowercased.\n     Key"
+    )
+    key = normalize_hex_string(key)
+
+    if is_hex_key(key):
+        private_key = PrivateKey.from_hex(key)
+        conda_content_trust.signing.sign_signable(metadata, private_key)
+        print(MODIFY_METADATA_SIGNED)
+
+    elif is_gpg_fingerprint(key):
         try:
-            new_thresh = int(new_thresh)
-            if not new_thresh >= 1:
-                raise ValueError()
-        except (ValueError, TypeError):
-            print(
-                F_OPTS + "\n--- " + RED + "Invalid value.  Expecting integer "
-                "greater than or equal to 1.  Please try again." + ENDC
-            )
-            return 0
+            root_signing.sign_root_metadata_dict_via_gpg(metadata, key)
+        except (ValueError, TypeError, ImportError):
+            print(MODIFY_METADATA_SIGNING_FAILED)
+        else:
+            print(MODIFY_METADATA_SIGNED)
 
-        metadata["signed"]["delegations"][delegation]["threshold"] = new_thresh
+    else:
+        print(MODIFY_METADATA_UNRECOGNIZED_KEY)
+    return 0
 
-        print(F_OPTS + "\n--- Threshold successfully updated." + ENDC)
 
-        return 0
+def _modify_remsig(metadata):
+    return 0
 
-    def fn_addkey():
-        return 0
 
-    def fn_remkey():
+def _modify_update(metadata):
+    return 0
+
+
+def _modify_adddel(metadata):
+    return 0
+
+
+def _modify_remdel(metadata):
+    return 0
+
+
+def _modify_thresh(metadata):
+    delegation = _promptfor(
+        "a delegation name (one of the entries in the"
+        '\n     "delegations" dictionary in the metadata above).  '
+        "This will\n     be the delegation whose threshold number of "
+        "required keys we\n     will change."
+    )
+    if delegation not in metadata["signed"]["delegations"]:
+        print(MODIFY_METADATA_UNKNOWN_DELEGATION)
         return 0
 
-    options = {
-        0: [fn_write, "Done: write and save metadata"],
-        1: [fn_abort, "Abort: discard changes -- abort without writing"],
-        2: [fn_addsig, "Add a signature (sign with a key you have)"],
-        3: [fn_remsig, "Remove a signature"],
-        4: [fn_update, "Update any top-level dictionary entry"],
-        5: [fn_adddel, "Add a delegation"],
-        6: [fn_remdel, "Remove a delegation"],
-        7: [fn_thresh, "Change the threshold number of keys for a delegation"],
-        8: [fn_addkey, "Add an authorized key to a delegation"],
-        9: [fn_remkey, "Remove an authorized key from a delegation"],
-    }
-
-    option_text = (
-        F_INSTRUCT + "\n--- Please choose an operation by entering its "
-        "number\n" + ENDC
+    new_thresh = _promptfor(
+        "a new threshold value.  The current value is "
+        + str(metadata["signed"]["delegations"][delegation]["threshold"])
     )
-    for index in options:
-        option_text += (
-            "    "
-            + F_LABEL
-            + str(index)
-            + ENDC
-            + ": "
-            + options[index][1]
-            + ENDC
-            + "\n"
-        )
 
-    done = False
-    while not done:
-        print(
-            F_OPTS
-            + BOLD
-            + "\n\n---------------------\n--- Current metadata:\n---------------------\n"
-            + ENDC
-        )
+    try:
+        new_thresh = int(new_thresh)
+        if not new_thresh >= 1:
+            raise ValueError()
+    except (ValueError, TypeError):
+        print(MODIFY_METADATA_INVALID_THRESHOLD)
+        return 0
 
-        if pygments is not None:
-            formatted_metadata = dumps(metadata, sort_keys=True, indent=4)
-            print(
-                pygments.highlight(
-                    formatted_metadata.encode("utf-8"),
-                    pygments.lexers.JsonLexer(),
-                    pygments.formatters.TerminalFormatter(),
-                )
-            )
-        else:
-            pprint.pprint(metadata)
+    metadata["signed"]["delegations"][delegation]["threshold"] = new_thresh
 
-        print(option_text)
-        selected = input(F_OPTS + "Choice: " + ENDC)
-        try:
-            selected = int(selected)
-        except (ValueError, TypeError):
-            print(RED + BOLD + "\nInvalid entry.  Try again.\n" + ENDC)
-            continue
-        if selected not in options:
-            print(RED + BOLD + "\nInvalid entry.  Try again.\n" + ENDC)
-            continue
+    print(MODIFY_METADATA_THRESHOLD_UPDATED)
 
-        print(F_OPTS + '\nChose "' + options[selected][1] + '"' + ENDC)
+    return 0
 
-        done = options[selected][0]()  # Run the func associated with the option.
 
-    # Pull modified from debugging script
-    # Pull modified from debugging script
-    # Pull modified from debugging script
+def _modify_addkey(metadata):
+    return 0
 
 
-# Basic text formatting string constants
-PINK = "\033[95m"
-BLUE = "\033[94m"
-CYAN = "\033[96m"
-GREEN = "\033[92m"
-YELLOW = "\033[93m"
-RED = "\033[91m"
-ENDC = "\033[0m"
-BOLD = "\033[1m"
-UNDERLINE = "\033[4m"
+def _modify_remkey(metadata):
+    return 0
 
-# Complete formats
-F_LABEL = ENDC + UNDERLINE + BOLD + PINK
-F_INSTRUCT = ENDC + BOLD + PINK
-F_OPTS = ENDC + GREEN
+
+# Each option's function takes the metadata being modified (changing it in
+# place) and returns whether the session is over.  They are paired with their
+# labels and keyed by the choice the user types for them;
+# MODIFY_METADATA_OPTIONS_TEXT lists them in this same order.
+MODIFY_METADATA_OPTIONS = {
+    str(i): option
+    for i, option in enumerate(
+        zip(
+            (
+                _modify_write,
+                _modify_abort,
+                _modify_addsig,
+                _modify_remsig,
+                _modify_update,
+                _modify_adddel,
+                _modify_remdel,
+                _modify_thresh,
+                _modify_addkey,
+                _modify_remkey,
+            ),
+            MODIFY_METADATA_OPTION_LABELS,
+        )
+    )
+}
 
 
 if __name__ == "__main__":
@@ -9,12 +9,14 @@ Function Manifest for this Module, by Category
 
 Encoding:
   x  canonserialize
+  x  deepcopy_json
 
 Formats and Validation:
      PrivateKey  -- extends cryptography.hazmat.primitives.asymmetric.ed25519.Ed25519PrivateKey
      PublicKey   -- extends cryptography.hazmat.primitives.asymmetric.ed25519.Ed25519PublicKey
      checkformat_string
   x  is_hex_string
+  x  normalize_hex_string
   x  is_hex_signature
   r  is_hex_key
   r  checkformat_hex_key
@@ -48,14 +50,29 @@ Exceptions:
 
 from __future__ import annotations
 
-from binascii import hexlify, unhexlify
+import mmap
+import os
+import shutil
+import string
+from contextlib import suppress
+from copy import deepcopy
 from datetime import datetime, timedelta
-from json import dumps, load
+from json import JSONEncoder, dumps, loads
 from typing import Any, Protocol
 
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+# orjson is an optional dependency, used only to speed up the parsing and
+# canonical serialization of metadata.  In its absence, the json library is
+# used instead.
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    ORJSON_AVAILABLE = False
+
 # specification version for the metadata produced by conda-content-trust
 # Details in the Conda Security Metadata Specification.  Note that this
 # version string is parsed via setuptools's packaging.version library, and so
@@ -122,13 +139,22 @@ def canonserialize(obj):
     by both strings and integers, a TypeError will be raised complaining about
     comparing strings and integers during the sort.  (Each dictionary in an
     object must be indexed only by strings or only by integers.)
+
+    When orjson is available, it is used to produce the very same bytes for
+    the objects where it is known to do so (see _canonserialize_via_orjson),
+    which is most metadata; the json library handles the rest.
     """
 
+    if ORJSON_AVAILABLE:
+        serialized = _canonserialize_via_orjson(obj)
+        if serialized is not None:
+            return serialized
+
     # Try converting to a JSON string.
     try:
         # TODO: In the future, assess whether or not to employ more typical
         #       practice of using no whitespace (instead of NLs and 2-indent).
-        json_string = dumps(obj, indent=2, sort_keys=True)
+        json_string = _CANONICAL_JSON_ENCODER.encode(obj)
     except TypeError:
         # TODO: ✅ Log or craft/use an appropriate exception class.
         raise
@@ -136,32 +162,266 @@ def canonserialize(obj):
     return json_string.encode("utf-8")
 
 
+# The encoder canonserialize uses: json.dumps(obj, indent=2, sort_keys=True)
+# would build an identical one on every call.
+_CANONICAL_JSON_ENCODER = JSONEncoder(indent=2, sort_keys=True)
+
+
+def _canonserialize_via_orjson(obj):
+    """
+    Returns canonserialize(obj), as produced by orjson (which is much faster
+    than the json library at it), or None if orjson's output might differ
+    from the json library's for this object.
+
+    With keys sorted and 2-space indentation, the two libraries agree
+    byte-for-byte on dictionaries, lists, tuples, strings, integers, booleans
+    and None, with these exceptions, which are left to the json library:
+     - floats: orjson writes exponents differently (1e16 instead of 1e+16)
+       and writes NaN and infinities as null
+     - non-ASCII and DEL characters: the json library escapes them, orjson
+       writes them out as UTF-8
+     - dictionaries indexed by anything but strings, and integers beyond 64
+       bits: orjson refuses them
+     - anything else (e.g. subclasses of dict or str), which orjson may
+       serialize where the json library would raise a TypeError, or
+       differently
+    """
+    # Serialize first: orjson gives up on self-referencing objects (at its
+    # recursion limit), so once it has succeeded, the type check below is
+    # sure to finish.
+    try:
+        serialized = orjson.dumps(obj, option=_ORJSON_CANONICAL_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None
+
+    if not serialized.isascii() or b"\x7f" in serialized:
+        return None
+
+    # Check types, walking the object without recursion.
+    unchecked = [obj]
+    while unchecked:
+        item = unchecked.pop()
+        item_type = type(item)
+        if item_type is dict:
+            unchecked.extend(item.values())
+        elif item_type is list or item_type is tuple:
+            unchecked.extend(item)
+        elif item_type not in _ORJSON_CANONICAL_SCALAR_TYPES:
+            return None
+
+    return serialized
+
+
+_ORJSON_CANONICAL_SCALAR_TYPES = {str, int, bool, type(None)}
+if ORJSON_AVAILABLE:
+    _ORJSON_CANONICAL_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+
+def _iter_canonserialized(obj, depth, indent=b""):
+    """
+    Yields canonserialize(obj) in pieces, so that large metadata (e.g. a
+    repodata.json with many artifacts) can be written out without ever holding
+    the entire serialization in memory.
+
+    Dictionaries indexed only by strings are split into their entries, down to
+    the given depth.  At the deepest level, entries are serialized a batch at a
+    time, which keeps this nearly as fast as serializing everything at once,
+    and each batch is re-indented to its position in the output.  (JSON
+    strings never contain a raw newline, so every newline in a serialization
+    begins a new line of it.)
+    """
+    obj_type = type(obj)
+    if not (
+        depth
+        and obj_type is dict
+        and obj
+        and all(key_type is str for key_type in map(type, obj))
+    ):
+        serialized = canonserialize(obj)
+        if indent:
+            serialized = serialized.replace(b"\n", b"\n" + indent)
+        yield serialized
+        return
+
+    keys = sorted(obj)
+    if depth > 1:
+        inner_indent = indent + b"  "
+        separator = b"{\n"
+        for key in keys:
+            yield separator + inner_indent + dumps(key).encode("utf-8") + b": "
+            yield from _iter_canonserialized(obj[key], depth - 1, inner_indent)
+            separator = b",\n"
+    else:
+        separator = b"{\n"
+        for start in range(0, len(keys), _CANONSERIALIZE_BATCH_SIZE):
+            batch = {
+                k: obj[k] for k in keys[start : start + _CANONSERIALIZE_BATCH_SIZE]
+            }
+            # Drop the batch's own opening "{\n" and closing "\n}".
+            serialized = canonserialize(batch)[2:-2]
+            if indent:
+                serialized = indent + serialized.replace(b"\n", b"\n" + indent)
+            yield separator + serialized
+            separator = b",\n"
+    yield b"\n" + indent + b"}"
+
+
+_CANONSERIALIZE_BATCH_SIZE = 1024
+
+
+def deepcopy_json(obj):
+    """
+    Returns a deep copy of the given JSON-compatible object (e.g. metadata
+    loaded by load_metadata_from_file).
+
+    The result is the same as copy.deepcopy's, but dictionaries, lists, and
+    the immutable values found in JSON are handled directly, which is several
+    times faster for large metadata.  Anything else (e.g. tuples, or
+    subclasses of dict) is left to copy.deepcopy.
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {key: deepcopy_json(value) for key, value in obj.items()}
+    elif obj_type is list:
+        return [deepcopy_json(value) for value in obj]
+    elif obj_type in _IMMUTABLE_JSON_TYPES:
+        return obj
+    else:
+        return deepcopy(obj)
+
+
+_IMMUTABLE_JSON_TYPES = {str, int, float, bool, type(None)}
+
+
+# Files at least this large (in bytes) are memory-mapped by
+# load_metadata_from_file instead of being read into a buffer; below it the
+# cost of setting up the mapping outweighs the copy it saves.
+MMAP_THRESHOLD = 64 * 1024
+
+
 def load_metadata_from_file(fname):
     # TODO ✅: Argument validation for fname.  Consider adding "pathvalidate"
     #          as a dependency, and calling its sanitize_filename() here.
 
     with open(fname, "rb") as fobj:
-        metadata = load(fobj)
+        if os.fstat(fobj.fileno()).st_size < MMAP_THRESHOLD:
+            metadata = _loads(fobj.read())
+        else:
+            # Large files are mapped rather than read, so that orjson can parse
+            # straight out of the page cache without an intermediate copy.
+            with mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    metadata = _loads(view)
 
     # TODO ✅: Consider validating what is read here, for everywhere.
 
     return metadata
 
 
+def _loads(data):
+    """
+    Parses the given JSON bytes, using orjson if it is available and the json
+    library otherwise.
+
+    orjson is stricter than the json library (e.g. it rejects NaN), so input
+    that orjson refuses is handed to the json library instead.  orjson also
+    parses integers too wide for 64 bits as floats, where the json library
+    keeps them exact, so input that may hold such an integer is parsed by the
+    json library, too.  Either way, the result is what the json library would
+    have produced.
+    """
+    if ORJSON_AVAILABLE and not _may_hold_wide_integer(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+
+    if isinstance(data, memoryview):
+        # The json library only accepts str, bytes and bytearray.
+        data = data.tobytes()
+
+    return loads(data)
+
+
+def _may_hold_wide_integer(data):
+    """
+    Returns True if the given JSON bytes may hold an integer that orjson would
+    parse as a float.  orjson keeps integers in [-2**63, 2**64) exact, so only
+    a run of 19 or more digits written as a number token can be one.
+
+    The scan runs in C (bytes.translate, then bytes.find) rather than over the
+    parsed objects, which would cost more than the parse itself.  Runs of
+    digits inside strings (e.g. in a sha256 hash) are almost always bounded by
+    letters or quotes, so they are passed over; those that are not just cost a
+    parse by the json library.
+    """
+    digits = bytes(data).translate(_DIGITS_TO_ZEROS)
+    start = digits.find(_WIDE_INTEGER_RUN)
+    while start != -1:
+        end = start + len(_WIDE_INTEGER_RUN)
+        while digits[end : end + 1] == b"0":
+            end += 1
+
+        before = start - 1
+        if before >= 0 and digits[before] == ord("-"):
+            before -= 1
+        if (before < 0 or digits[before] in _NUMBER_PRECEDERS) and (
+            end == len(digits) or digits[end] in _NUMBER_FOLLOWERS
+        ):
+            return True
+
+        start = digits.find(_WIDE_INTEGER_RUN, end)
+    return False
+
+
+_DIGITS_TO_ZEROS = bytes.maketrans(b"123456789", b"000000000")
+_WIDE_INTEGER_RUN = b"0" * 19
+# The bytes that can come right before and after a number in JSON.
+_NUMBER_PRECEDERS = frozenset(b" \t\n\r:,[")
+_NUMBER_FOLLOWERS = frozenset(b" \t\n\r,]}")
+
+
 def write_metadata_to_file(metadata, filename):
     """
     Canonicalizes and serializes JSON-friendly metadata, and writes that to the
     given filename.
+
+    The metadata is written to a temporary file beside the given one, which
+    is flushed to disk and then replaces it, so the file never holds partially
+    written metadata (and an existing file is left as it was if writing
+    fails).  An existing file's permissions are kept, and if the filename is a
+    symbolic link, the file it points to is the one replaced.
     """
 
     # TODO ✅: Argument validation for filename.  Consider adding
     #          "pathvalidate" as a dependency, and calling its
     #          sanitize_filename() here.
 
-    metadata = canonserialize(metadata)
+    filename = os.path.realpath(filename)
+    temp_filename = f"{filename}.{os.urandom(4).hex()}.tmp"
 
-    with open(filename, "wb") as fobj:
-        fobj.write(metadata)
+    fobj = open(temp_filename, "xb")
+    try:
+        with fobj:
+            # Write the metadata out in pieces, splitting it two levels deep
+            # (e.g. into batches of the artifacts in repodata's "packages"),
+            # instead of serializing all of it at once first.  The bytes
+            # written are exactly canonserialize(metadata).
+            fobj.writelines(_iter_canonserialized(metadata, 2))
+            # Make sure the metadata is on disk before it takes the place of
+            # the file, so that a crash can't leave an empty or truncated file
+            # under the given name.
+            fobj.flush()
+            os.fsync(fobj.fileno())
+
+        if os.path.exists(filename):
+            shutil.copymode(filename, temp_filename)
+        os.replace(temp_filename, filename)
+
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_filename)
+        raise
 
 
 class MixinKey:
@@ -173,7 +433,7 @@ class MixinKey:
 
     @classmethod
     def to_hex(cls, key):
-        return hexlify(cls.to_bytes(key)).decode("utf-8")
+        return cls.to_bytes(key).hex()
 
     @classmethod
     def is_equivalent_to(cls, k1, k2):
@@ -192,7 +452,7 @@ class MixinKey:
         # but do not produce helpful errors if the argument provided it is not
         # the right type, so we'll do that here before calling them.
         checkformat_hex_key(key_value_in_hex)
-        key_value_in_bytes = unhexlify(key_value_in_hex)
+        key_value_in_bytes = bytes.fromhex(key_value_in_hex)
         new_object = cls.from_bytes(key_value_in_bytes)
         checkformat_key(new_object)
         return new_object
@@ -314,6 +574,25 @@ def checkformat_hex_string(hex_string: Any) -> HexString:
     return hex_string
 
 
+def normalize_hex_string(hex_string: str) -> str:
+    """
+    Returns the given string with all whitespace removed and any upper-case
+    (ASCII) letters lower-cased, e.g. to turn a key or an OpenPGP fingerprint
+    as GPG displays it ("F075 DD2F ...") into the form checkformat_hex_string
+    expects.  Does not check that the result is actually hexadecimal.
+    """
+    return hex_string.translate(_HEX_STRING_NORMALIZATION)
+
+
+# Lower-cases letters and deletes whitespace -- including the non-breaking
+# spaces GPG sometimes puts into fingerprints -- in one pass.
+_HEX_STRING_NORMALIZATION = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    string.whitespace + "\xa0",
+)
+
+
 def is_hex_signature(hex_signature: Any) -> bool:
     """
     Returns True if key is a hex string with no uppercase characters, no
@@ -483,6 +762,12 @@ def checkformat_gpg_fingerprint(gpg_fingerprint: Any) -> GPGFingerprint:
     See is_gpg_fingerprint.  Raises a TypeError if is_gpg_fingerprint is not
     True.
     """
+    if not isinstance(gpg_fingerprint, str):
+        raise TypeError(
+            "Expected a GPG fingerprint as a string, but the given value is of "
+            "type " + str(type(gpg_fingerprint)) + "."
+        )
+
     if len(gpg_fingerprint) != 40:
         raise ValueError(
             'The given value, "' + str(gpg_fingerprint) + '", is not a full '
@@ -495,9 +780,9 @@ def checkformat_gpg_fingerprint(gpg_fingerprint: Any) -> GPGFingerprint:
     # implications.  For example, we cannot permit two signatures from the
     # same key -- with the key represented differently -- to count as two
     # signatures from distinct keys.
-    # local hex test. isalnum() checks for no whitespace.
-    bytes.fromhex(gpg_fingerprint)
-    if not gpg_fingerprint.isalnum() or gpg_fingerprint.lower() != gpg_fingerprint:
+    # local hex test: stripping every lower-case hex digit from both ends of
+    # the string leaves nothing only if that is all the string contains.
+    if gpg_fingerprint.strip(_LOWER_HEXDIGITS):
         raise ValueError(
             "Expected a hex string; non-hexadecimal or upper-case character found."
         )
@@ -505,6 +790,9 @@ def checkformat_gpg_fingerprint(gpg_fingerprint: Any) -> GPGFingerprint:
     return gpg_fingerprint
 
 
+_LOWER_HEXDIGITS = "0123456789abcdef"
+
+
 def is_gpg_signature(gpg_signature: Any) -> bool:
     # TODO: ✅ docstring based on docstring from checkformat_gpg_signature
 
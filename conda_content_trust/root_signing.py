@@ -18,6 +18,8 @@ Note that there is a function in conda_content_trust.authentication that verifie
 signatures without requiring securesystemslib.
 """
 
+from functools import lru_cache
+
 # securesystemslib is an optional dependency, and required only for signing
 # root metadata via GPG.  Verification of those signatures, and signing other
 # metadata with raw ed25519 signatures, does not require securesystemslib.
@@ -36,6 +38,7 @@ from .common import (
     checkformat_hex_key,
     is_signable,
     load_metadata_from_file,
+    normalize_hex_string,
     write_metadata_to_file,
 )
 
@@ -293,12 +296,26 @@ def fetch_keyval_from_gpg(fingerprint):
     """
     _check_sslib_available()
 
-    fingerprint = (
-        fingerprint.lower().replace(" ", "").replace("\xa0", "")
-    )  # \xa0 is another space character that GPG sometimes outputs
+    # One pass; also drops \xa0, another space character GPG sometimes outputs.
+    fingerprint = normalize_hex_string(fingerprint)
 
     checkformat_gpg_fingerprint(fingerprint)
 
+    return _fetch_keyval_from_gpg(fingerprint)
+
+
+@lru_cache(maxsize=32)
+def _fetch_keyval_from_gpg(fingerprint):
+    """
+    Does the work of fetch_keyval_from_gpg, given an already normalized and
+    checked fingerprint.
+
+    Exporting a key from GPG means running gpg in a subprocess, so the results
+    are cached: signing several pieces of metadata with the same key then only
+    exports it once.  (Failures are not cached.)  Call
+    _fetch_keyval_from_gpg.cache_clear() to forget the keys fetched so far,
+    e.g. after changing the keyring.
+    """
     key_parameters = gpg_funcs.export_pubkey(fingerprint)
 
     return key_parameters["keyval"]["public"]["q"]
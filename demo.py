@@ -95,7 +95,7 @@ def demo_create_and_sign_key_mgr():
         # expiration  default: now plus root expiration default duration
     )
 
-    key_mgr = cct_signing.wrap_as_signable(key_mgr)
+    key_mgr = cct_signing.wrap_as_signable(key_mgr, copy=False)
 
     # sign dictionary in place
     cct_signing.sign_signable(key_mgr, prikey_keymgr)
@@ -134,7 +134,7 @@ def demo_root_signing_and_verifying_and_chaining():
     )
 
     # Wrap the metadata in a signing envelope.
-    root_md = cct_signing.wrap_as_signable(root_md)
+    root_md = cct_signing.wrap_as_signable(root_md, copy=False)
 
     root_md_serialized_unsigned = cct_common.canonserialize(root_md)
 
@@ -194,7 +194,7 @@ def demo_root_signing_and_verifying_and_chaining():
 
     # Wrap the version 2 metadata in a signing envelope, canonicalize it, and
     # serialize it to write to disk.
-    root_md2 = cct_signing.wrap_as_signable(root_md2)
+    root_md2 = cct_signing.wrap_as_signable(root_md2, copy=False)
     root_md2 = cct_common.canonserialize(root_md2)
 
     # Write unsigned sample root metadata.
@@ -240,7 +240,7 @@ def demo_root_signing_and_verifying_and_chaining():
 
     # Wrap the version 2 metadata in a signing envelope, canonicalize it, and
     # serialize it to write to disk.
-    root_md3 = cct_signing.wrap_as_signable(root_md3)
+    root_md3 = cct_signing.wrap_as_signable(root_md3, copy=False)
     root_md3 = cct_common.canonserialize(root_md3)
 
     # Write unsigned sample root metadata.
@@ -16,6 +16,7 @@ from pathlib import Path
 import cryptography.exceptions
 import pytest
 
+from conda_content_trust import authentication
 from conda_content_trust.authentication import (
     verify_delegation,
     verify_root,
@@ -478,6 +479,47 @@ def test_verify_root():
         verify_root(TEST_ROOT_MD_V1, root_v2_edited)
 
 
+def test_verify_root_serializes_once(monkeypatch):
+    serialized = []
+
+    def canonserialize(obj):
+        serialized.append(obj)
+        return real_canonserialize(obj)
+
+    real_canonserialize = authentication.canonserialize
+    monkeypatch.setattr(authentication, "canonserialize", canonserialize)
+
+    verify_root(TEST_ROOT_MD_V1, TEST_ROOT_MD_V2)
+    assert serialized == [TEST_ROOT_MD_V2["signed"]]
+
+
+def test_verify_signable_stops_at_threshold(monkeypatch):
+    signable = wrap_as_signable({"foo": "bar"})
+    public_hexes = []
+    for _ in range(3):
+        private, public = gen_keys()
+        sign_signable(signable, private)
+        public_hexes.append(PublicKey.to_hex(public))
+
+    verified = []
+
+    def verify_signature(signature, public_key, data):
+        verified.append(signature)
+        return real_verify_signature(signature, public_key, data)
+
+    real_verify_signature = authentication.verify_signature
+    monkeypatch.setattr(authentication, "verify_signature", verify_signature)
+
+    verify_signable(signable, public_hexes, 2)
+    assert len(verified) == 2
+
+    # Bad signatures don't count towards the threshold.
+    signable["signatures"][public_hexes[0]]["signature"] = "00" * 64
+    verified.clear()
+    verify_signable(signable, public_hexes, 2)
+    assert len(verified) == 3
+
+
 def test_verify_delegation_coverage():
     """
     Coverage tests for conda_content_trust.authentication.verify_delegation
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
 import sys
 from pathlib import Path
 
 import pytest
 
+import conda_content_trust.cli
 import conda_content_trust.root_signing
 import conda_content_trust.signing
 from conda_content_trust.cli import (
@@ -81,10 +84,39 @@ def test_main(monkeypatch):
         __import__("conda_content_trust.__main__")
 
 
-def test_cli_no_securesystemslib(monkeypatch):
-    monkeypatch.setattr(conda_content_trust.root_signing, "SSLIB_AVAILABLE", False)
+def test_cli_no_securesystemslib(monkeypatch, capsys):
+    monkeypatch.setattr(conda_content_trust.cli, "_sslib_available", lambda: False)
     with pytest.raises(SystemExit):
-        cli([])
+        cli(["--help"])
+    assert "[Unavailable]" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_cli_sslib_unusable(tmp_path, installed):
+    # A securesystemslib without the gpg subpackage (e.g. 1.x) is no more
+    # usable for GPG signing than a missing one.
+    package = tmp_path / "securesystemslib"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    code = "import sys, conda_content_trust.cli as cli; "
+    if not installed:
+        code += "sys.modules['securesystemslib'] = None; "
+    code += "sys.exit(cli._sslib_available())"
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(tmp_path)},
+    )
+
+
+def test_cli_import_defers_root_signing():
+    # root_signing (and with it securesystemslib) is only imported when a GPG
+    # subcommand runs, so that it does not slow down every other invocation.
+    code = (
+        "import sys, conda_content_trust.cli; "
+        "sys.exit('conda_content_trust.root_signing' in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
 
 
 def test_cli_build_parser():
@@ -110,13 +142,20 @@ def test_cli_build_parser():
 
 
 def test_cli_gpg_sign(monkeypatch):
+    calls = []
+
     def mock(*args):
-        pass
+        calls.append(args)
 
     monkeypatch.setattr(
         conda_content_trust.root_signing, "sign_root_metadata_via_gpg", mock
     )
     cli(["gpg-sign", "file1", "file2"])
+    assert calls == [("file2", "file1")]
+
+    calls.clear()
+    cli(["gpg-sign", "F075 DD2F", "file1", "file2"])
+    assert calls == [("file1", "f075dd2f"), ("file2", "f075dd2f")]
 
 
 def test_cli_sign_artifacts(monkeypatch, tmp_path):
@@ -139,6 +178,41 @@ def test_cli_sign_artifacts(monkeypatch, tmp_path):
     cli(["sign-artifacts", "repodata-filename", str(hex_key)])
 
 
+def test_cli_sign_artifacts_jobs(monkeypatch, tmp_path):
+    calls = []
+
+    def mock(*args):
+        calls.append(args)
+
+    hex_key = tmp_path / "key.hex"
+    hex_key.write_text("a" * 64)
+    monkeypatch.setattr(conda_content_trust.signing, "sign_all_in_repodata", mock)
+
+    cli(["sign-artifacts", "repodata-filename", str(hex_key)])
+    cli(["sign-artifacts", "--jobs", "3", "repodata-filename", str(hex_key)])
+
+    assert calls == [
+        ("repodata-filename", "a" * 64, None),
+        ("repodata-filename", "a" * 64, 3),
+    ]
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2", "two"])
+def test_cli_sign_artifacts_jobs_invalid(monkeypatch, capsys, jobs):
+    def fail_if_called(*args):
+        assert False
+
+    monkeypatch.setattr(
+        conda_content_trust.signing, "sign_all_in_repodata", fail_if_called
+    )
+
+    # Reported as a usage error, rather than failing inside signing.
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["sign-artifacts", "--jobs", jobs, "repodata-filename", "key-filename"])
+    assert exc_info.value.code == 2
+    assert "expected a positive integer" in capsys.readouterr().err
+
+
 def test_cli_gpg_key_lookup(monkeypatch):
     def mock(*args):
         pass
@@ -147,6 +221,52 @@ def test_cli_gpg_key_lookup(monkeypatch):
     cli(["gpg-key-lookup", "fingerprint"])
 
 
-# TODO Difficult to test this interactive command
-# def test_cli_modify_metadata():
-#     pass
+def test_cli_modify_metadata(monkeypatch, tmp_path):
+    """
+    Drive the interactive prompt: an invalid entry, a threshold change, then
+    write the result out.
+    """
+    out_fname = tmp_path / "2.root.json"
+    responses = iter(["not an option", "7", "root", "2", "0", str(out_fname)])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(responses))
+
+    cli(["modify-metadata", "tests/testdata/1.root.json"])
+
+    modified = json.loads(out_fname.read_text())
+    assert modified["signed"]["delegations"]["root"]["threshold"] == 2
+
+
+def test_cli_modify_metadata_highlights_changes_only(monkeypatch):
+    pygments = pytest.importorskip("pygments")
+
+    highlighted = []
+    real_highlight = pygments.highlight
+
+    def highlight(code, lexer, formatter):
+        highlighted.append(code)
+        return real_highlight(code, lexer, formatter)
+
+    monkeypatch.setattr(pygments, "highlight", highlight)
+    responses = iter(["x", "x", "7", "root", "2", "1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(responses))
+
+    cli(["modify-metadata", "tests/testdata/1.root.json"])
+
+    # Four prompts, but the metadata only changed once along the way.
+    assert len(highlighted) == 2
+
+
+def test_cli_modify_metadata_no_color(monkeypatch, capsys):
+    pygments = pytest.importorskip("pygments")
+
+    def highlight(code, lexer, formatter):
+        raise AssertionError("--no-color should skip highlighting")
+
+    monkeypatch.setattr(pygments, "highlight", highlight)
+    responses = iter(["1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(responses))
+
+    cli(["modify-metadata", "--no-color", "tests/testdata/1.root.json"])
+
+    metadata = json.loads(Path("tests/testdata/1.root.json").read_text())
+    assert json.dumps(metadata, sort_keys=True, indent=4) in capsys.readouterr().out
@@ -7,12 +7,16 @@ Run the tests this way:
     pytest tests/test_common.py
 """
 
+import copy
 import json
 import os
+from collections import OrderedDict
 from datetime import timedelta
+from pathlib import Path
 
 import pytest
 
+from conda_content_trust import common
 from conda_content_trust.common import (
     PrivateKey,
     PublicKey,
@@ -29,6 +33,7 @@ from conda_content_trust.common import (
     checkformat_list_of_hex_keys,
     checkformat_signature,
     checkformat_string,
+    deepcopy_json,
     ed25519,
     is_gpg_fingerprint,
     is_gpg_signature,
@@ -36,6 +41,9 @@ from conda_content_trust.common import (
     is_signature,
     keyfiles_to_bytes,
     keyfiles_to_keys,
+    load_metadata_from_file,
+    normalize_hex_string,
+    write_metadata_to_file,
 )
 
 # A 40-hex-character GPG public key fingerprint
@@ -126,7 +134,12 @@ REG__HASH_HEX = "73aec9a93f4beb41a9bad14b9d1398f60e78ccefd97e4eb7d3cf26ba71dbe0c
 #     # TODO: Test more?  Unusual input
 
 
-def test_canonserialize():
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_canonserialize(monkeypatch, orjson_available):
+    if orjson_available and not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+    monkeypatch.setattr(common, "ORJSON_AVAILABLE", orjson_available)
+
     # Simple primitives
     assert canonserialize("") == b'""'
     assert canonserialize("a") == b'"a"'
@@ -157,6 +170,266 @@ def test_canonserialize():
     # TODO: Tricksy tests that mess with encoding.
 
 
+def _repodata_artifacts(fname):
+    with open(fname) as fobj:
+        repodata = json.load(fobj)
+    return [
+        *repodata.get("packages", {}).values(),
+        *repodata.get("packages.conda", {}).values(),
+    ]
+
+
+class _Str(str):
+    pass
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        # Whole metadata files, and the artifact records that get signed.
+        *(
+            json.loads(Path("tests/testdata", fname).read_text())
+            for fname in (
+                "1.root.json",
+                "2.root.json",
+                "3.root.json",
+                "key_mgr.json",
+                "repodata_sample.json",
+                "repodata_short_signed_sample.json",
+            )
+        ),
+        *_repodata_artifacts("tests/testdata/repodata_sample.json"),
+        # Values on which orjson and the json library disagree, which must be
+        # left to the json library.
+        {"floats": [0.1, 1.5, -2.0, 1e16, 1e-7, 1.7976931348623157e308]},
+        [float("nan"), float("inf"), float("-inf")],
+        {"text": "é ü 中文 \U0001f600", "del": "\x7f", "controls": "\x00\x1f\n\t"},
+        {"big": [2**63, 2**64, -(2**63) - 1, 2**100]},
+        {1: "int", 2: {3: None}},
+        {False: "no", True: "yes"},
+        {None: "none"},
+        OrderedDict([("b", 1), ("a", 2)]),
+        {"subclass": _Str("value")},
+        ((1, "a"), [()], {"": []}),
+    ],
+)
+def test_canonserialize_matches_json(obj):
+    if not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+
+    # Whatever serializes the object, the bytes signed must be exactly what
+    # the json library produces.
+    expected = json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+    assert canonserialize(obj) == expected
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_canonserialize_circular(monkeypatch, orjson_available):
+    if orjson_available and not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+    monkeypatch.setattr(common, "ORJSON_AVAILABLE", orjson_available)
+
+    # Self-referencing objects are refused, as the json library refuses them.
+    circular = {}
+    circular["self"] = circular
+    with pytest.raises(ValueError, match="Circular reference"):
+        canonserialize(circular)
+
+    circular = []
+    circular.append({"list": circular})
+    with pytest.raises(ValueError, match="Circular reference"):
+        canonserialize(circular)
+
+
+def test_deepcopy_json():
+    original = copy.deepcopy(SAMPLE_SIGNED_ROOT_MD)
+    copied = deepcopy_json(original)
+    assert copied == original
+    assert copied["signed"] is not original["signed"]
+
+    # Mutating the copy leaves the original alone.
+    copied["signed"]["delegations"]["root.json"]["pubkeys"].append("00" * 32)
+    copied["signatures"].clear()
+    assert original == SAMPLE_SIGNED_ROOT_MD
+
+    # Values that aren't plain JSON are still deep-copied faithfully.
+    nested = {"t": ({"a": [1]},), "o": OrderedDict(b=[2]), "nan": float("nan")}
+    copied = deepcopy_json(nested)
+    assert type(copied["t"]) is tuple and copied["t"][0] is not nested["t"][0]
+    assert type(copied["o"]) is OrderedDict and copied["o"] is not nested["o"]
+    assert copied["o"]["b"] is not nested["o"]["b"]
+    assert copied["nan"] != copied["nan"]
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, common.MMAP_THRESHOLD])
+@pytest.mark.parametrize("orjson_available", [True, False])
+@pytest.mark.parametrize(
+    "fname",
+    [
+        "tests/testdata/1.root.json",
+        "tests/testdata/key_mgr.json",
+        "tests/testdata/repodata_sample.json",
+    ],
+)
+def test_load_metadata_from_file(monkeypatch, fname, orjson_available, mmap_threshold):
+    if orjson_available and not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+    monkeypatch.setattr(common, "ORJSON_AVAILABLE", orjson_available)
+    # A threshold of 0 forces every file through the memory-mapped path.
+    monkeypatch.setattr(common, "MMAP_THRESHOLD", mmap_threshold)
+
+    with open(fname) as fobj:
+        expected = json.load(fobj)
+
+    assert load_metadata_from_file(fname) == expected
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, common.MMAP_THRESHOLD])
+def test_load_metadata_from_file_nonstandard_json(
+    monkeypatch, tmp_path, mmap_threshold
+):
+    # The json library accepts some things that orjson does not (e.g. NaN);
+    # these should still load, however the file is parsed.
+    monkeypatch.setattr(common, "MMAP_THRESHOLD", mmap_threshold)
+    fname = tmp_path / "nan.json"
+    fname.write_text('{"value": NaN}')
+
+    metadata = load_metadata_from_file(fname)
+    assert metadata["value"] != metadata["value"]  # NaN
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, common.MMAP_THRESHOLD])
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_load_metadata_from_file_wide_integers(
+    monkeypatch, tmp_path, orjson_available, mmap_threshold
+):
+    # orjson parses integers that do not fit in 64 bits as floats; they must
+    # still load exactly, as the json library loads them, or signatures over
+    # the metadata would no longer verify.
+    if orjson_available and not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+    monkeypatch.setattr(common, "ORJSON_AVAILABLE", orjson_available)
+    monkeypatch.setattr(common, "MMAP_THRESHOLD", mmap_threshold)
+    expected = {
+        "big": 2**64,
+        "small": -(2**64) - 1,
+        "nested": [{"big": 2**64 + 1}],
+        "float": 1e19,
+    }
+    fname = tmp_path / "wide.json"
+    fname.write_text(json.dumps(expected))
+
+    metadata = load_metadata_from_file(fname)
+    assert metadata == expected
+    assert isinstance(metadata["big"], int)
+    assert isinstance(metadata["small"], int)
+    assert isinstance(metadata["nested"][0]["big"], int)
+    assert isinstance(metadata["float"], float)
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, common.MMAP_THRESHOLD])
+@pytest.mark.parametrize(
+    "fname",
+    [
+        "tests/testdata/1.root.json",
+        "tests/testdata/repodata_sample.json",
+        # Long runs of digits in strings are not taken for wide integers.
+        {"sha256": "0" * 64, "note": "a:12345678901234567890x", "size": 10**18 - 1},
+    ],
+)
+def test_load_metadata_from_file_orjson_only(
+    monkeypatch, tmp_path, fname, mmap_threshold
+):
+    # Ordinary metadata is parsed by orjson alone, without falling back to the
+    # json library.
+    if not common.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not available")
+    monkeypatch.setattr(common, "MMAP_THRESHOLD", mmap_threshold)
+    if isinstance(fname, dict):
+        expected = fname
+        fname = tmp_path / "metadata.json"
+        fname.write_text(json.dumps(expected))
+    else:
+        with open(fname) as fobj:
+            expected = json.load(fobj)
+
+    def fail_if_called(*args):
+        assert False
+
+    monkeypatch.setattr(common, "loads", fail_if_called)
+    assert load_metadata_from_file(fname) == expected
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1024])
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        {},
+        [1, {"b": {}}],
+        {"packages": {}, "info": {"subdir": "noarch"}},
+        {"a": {"z": [1, {"y": "x\ny"}], "é": 1.5e20, "b": {"c": {"d": None}}}},
+        {1: {"a": 1}, 2: []},
+        {"a": {1: "one", 2: {"b": True}}},
+        "tests/testdata/repodata_sample.json",
+        "tests/testdata/1.root.json",
+    ],
+)
+def test_write_metadata_to_file(monkeypatch, tmp_path, metadata, batch_size):
+    # The file is written in pieces, which must add up to exactly the
+    # canonical serialization, however the pieces are batched.
+    monkeypatch.setattr(common, "_CANONSERIALIZE_BATCH_SIZE", batch_size)
+    if isinstance(metadata, str):
+        metadata = load_metadata_from_file(metadata)
+    fname = tmp_path / "metadata.json"
+
+    write_metadata_to_file(metadata, fname)
+
+    assert fname.read_bytes() == canonserialize(metadata)
+
+
+def test_write_metadata_to_file_replaces(tmp_path):
+    fname = tmp_path / "metadata.json"
+    fname.write_bytes(b"old")
+    fname.chmod(0o640)
+    link = tmp_path / "link.json"
+    link.symlink_to(fname)
+
+    # A failure partway through leaves the existing file alone.
+    with pytest.raises(TypeError):
+        write_metadata_to_file({"a": "b", "c": object()}, link)
+    assert fname.read_bytes() == b"old"
+    assert sorted(tmp_path.iterdir()) == [link, fname]
+
+    # Writing through the link replaces the file it points to, keeping the
+    # file's permissions.
+    write_metadata_to_file({"a": "b"}, link)
+    assert link.is_symlink()
+    assert fname.read_bytes() == canonserialize({"a": "b"})
+    assert fname.stat().st_mode & 0o777 == 0o640
+    assert sorted(tmp_path.iterdir()) == [link, fname]
+
+
+def test_write_metadata_to_file_syncs_before_replacing(monkeypatch, tmp_path):
+    calls = []
+    fsync, replace = os.fsync, os.replace
+
+    def mock_fsync(fd):
+        calls.append("fsync")
+        fsync(fd)
+
+    def mock_replace(src, dst):
+        calls.append("replace")
+        replace(src, dst)
+
+    monkeypatch.setattr(common.os, "fsync", mock_fsync)
+    monkeypatch.setattr(common.os, "replace", mock_replace)
+
+    fname = tmp_path / "metadata.json"
+    write_metadata_to_file({"a": "b"}, fname)
+    assert fname.read_bytes() == canonserialize({"a": "b"})
+    assert calls == ["fsync", "replace"]
+
+
 def test_keyfile_operations():
     """
     Unit tests for functions:
@@ -446,6 +719,21 @@ def test_checkformat_hex_string():
     checkformat_hex_string(SAMPLE_KEYVAL)
 
 
+@pytest.mark.parametrize(
+    "raw,normalized",
+    [
+        ("", ""),
+        ("aa", "aa"),
+        ("DEADbeef", "deadbeef"),
+        (" f075 DD2F\t6F4C\nb3bd \xa0 7613\r\n", "f075dd2f6f4cb3bd7613"),
+        # Only whitespace and case are normalized, and only in ASCII.
+        ("0xAG-É", "0xag-É"),
+    ],
+)
+def test_normalize_hex_string(raw, normalized):
+    assert normalize_hex_string(raw) == normalized
+
+
 def test_checkformat_hex_key():
     checkformat_hex_key("deadbeef" * 8)
     with pytest.raises(ValueError, match="upper-case"):
@@ -506,6 +794,16 @@ def test_is_gpg_fingerprint():
     assert not is_gpg_fingerprint(SAMPLE_FINGERPRINT + "a")
     # now uppercase allowed
     assert not is_gpg_fingerprint(SAMPLE_FINGERPRINT.upper())
+    # no whitespace, anywhere
+    assert not is_gpg_fingerprint(" " + SAMPLE_FINGERPRINT[1:])
+    assert not is_gpg_fingerprint(
+        SAMPLE_FINGERPRINT[:20] + " " + SAMPLE_FINGERPRINT[21:]
+    )
+    # only ASCII hex digits
+    assert not is_gpg_fingerprint(SAMPLE_FINGERPRINT[:-1] + "\u0660")
+    # strings only
+    assert not is_gpg_fingerprint(SAMPLE_FINGERPRINT.encode())
+    assert not is_gpg_fingerprint(None)
 
 
 def test_checkformat_gpg_signature():
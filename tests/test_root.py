@@ -249,6 +249,33 @@ def test_no_sslib(monkeypatch):
         root_signing.fetch_keyval_from_gpg(None)  # type: ignore
 
 
+@pytest.mark.skipif(not SSLIB_AVAILABLE, reason="requires securesystemslib")
+def test_fetch_keyval_from_gpg_cached(monkeypatch):
+    exported = []
+
+    def export_pubkey(fingerprint):
+        exported.append(fingerprint)
+        return SAMPLE_GPG_KEY_OBJ
+
+    monkeypatch.setattr(root_signing.gpg_funcs, "export_pubkey", export_pubkey)
+    root_signing._fetch_keyval_from_gpg.cache_clear()
+    try:
+        # The same key, as GPG might display it and as it is normalized.
+        assert root_signing.fetch_keyval_from_gpg(SAMPLE_FINGERPRINT) == SAMPLE_KEYVAL
+        assert (
+            root_signing.fetch_keyval_from_gpg(SAMPLE_FINGERPRINT.upper())
+            == SAMPLE_KEYVAL
+        )
+        displayed = " ".join(
+            SAMPLE_FINGERPRINT.upper()[i : i + 4] for i in range(0, 40, 4)
+        ).replace(" ", "\xa0", 4)
+        assert root_signing.fetch_keyval_from_gpg(displayed) == SAMPLE_KEYVAL
+    finally:
+        root_signing._fetch_keyval_from_gpg.cache_clear()
+
+    assert exported == [SAMPLE_FINGERPRINT]
+
+
 def test_sign_root_metadata_dict_via_gpg():
     with pytest.raises(TypeError, match="signable"):
         root_signing.sign_root_metadata_dict_via_gpg({}, "")
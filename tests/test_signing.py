@@ -17,10 +17,12 @@ import shutil
 
 import pytest
 
+from conda_content_trust import signing
 from conda_content_trust.authentication import verify_signature
 from conda_content_trust.common import (
     PublicKey,
     canonserialize,
+    is_signature,
     load_metadata_from_file,
 )
 from conda_content_trust.signing import sign_all_in_repodata, wrap_as_signable
@@ -97,6 +99,27 @@ def test_wrap_as_signable_default():
     assert signed == {"signatures": {}, "signed": obj}
 
 
+def test_wrap_as_signable_copies():
+    obj = {"foo": {"bar": ["baz"]}}
+    signed = wrap_as_signable(obj)
+    assert signed["signed"] == obj
+
+    # The wrapped object is a deep copy of the given one.
+    signed["signed"]["foo"]["bar"].append("quux")
+    assert obj == {"foo": {"bar": ["baz"]}}
+
+
+def test_wrap_as_signable_no_copy():
+    obj = {"foo": {"bar": ["baz"]}}
+    signed = wrap_as_signable(obj, copy=False)
+    assert signed == {"signatures": {}, "signed": obj}
+    assert signed["signed"] is obj
+
+    # The type check still applies.
+    with pytest.raises(TypeError):
+        wrap_as_signable(object(), copy=False)
+
+
 def test_wrap_as_signable_error():
     with pytest.raises(TypeError):
         wrap_as_signable(object())
@@ -125,8 +148,11 @@ def test_sign_all_invalid_repodata(tmp_path):
         sign_all_in_repodata(str(invalid_repodata), REG__PRIVATE_HEX)
 
 
-def test_sign_all_in_repodata(request):
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_sign_all_in_repodata(request, monkeypatch, jobs):
     request.addfinalizer(remove_sample_tempfile)
+    # Sign in worker processes even though the sample repodata is small.
+    monkeypatch.setattr(signing, "PARALLEL_SIGNING_THRESHOLD", 0)
 
     public = PublicKey.from_hex(REG__PUBLIC_HEX)
 
@@ -140,7 +166,7 @@ def test_sign_all_in_repodata(request):
 
     repodata = load_metadata_from_file(REG__REPODATA_SAMPLE_FNAME)
 
-    sign_all_in_repodata(REG__REPODATA_SAMPLE_TEMP_FNAME, REG__PRIVATE_HEX)
+    sign_all_in_repodata(REG__REPODATA_SAMPLE_TEMP_FNAME, REG__PRIVATE_HEX, jobs)
 
     repodata_signed = load_metadata_from_file(REG__REPODATA_SAMPLE_TEMP_FNAME)
 
@@ -156,6 +182,11 @@ def test_sign_all_in_repodata(request):
         repodata["packages.conda"].keys()
     ) == set(repodata_signed["signatures"].keys())
 
+    # Every signature entry is well-formed.
+    for signatures in repodata_signed["signatures"].values():
+        assert list(signatures) == [REG__PUBLIC_HEX]
+        assert is_signature(signatures[REG__PUBLIC_HEX])
+
     for artifact_name in repodata["packages"]:
         # There's a signature "by" this key listed for every artifact.
         assert REG__PUBLIC_HEX in repodata_signed["signatures"][artifact_name]
@@ -168,6 +199,69 @@ def test_sign_all_in_repodata(request):
         )
 
 
+def test_sign_all_in_repodata_small(request, monkeypatch):
+    request.addfinalizer(remove_sample_tempfile)
+    shutil.copy(REG__REPODATA_SAMPLE_FNAME, REG__REPODATA_SAMPLE_TEMP_FNAME)
+
+    def executor(*args, **kwargs):
+        raise AssertionError("small repodata should be signed in-process")
+
+    monkeypatch.setattr(signing, "ProcessPoolExecutor", executor)
+
+    sign_all_in_repodata(REG__REPODATA_SAMPLE_TEMP_FNAME, REG__PRIVATE_HEX, 2)
+
+    repodata_signed = load_metadata_from_file(REG__REPODATA_SAMPLE_TEMP_FNAME)
+    assert set(repodata_signed["signatures"]) == {
+        *repodata_signed["packages"],
+        *repodata_signed["packages.conda"],
+    }
+
+
+def test_sign_all_in_repodata_one_cpu(request, monkeypatch):
+    request.addfinalizer(remove_sample_tempfile)
+    shutil.copy(REG__REPODATA_SAMPLE_FNAME, REG__REPODATA_SAMPLE_TEMP_FNAME)
+    monkeypatch.setattr(signing, "PARALLEL_SIGNING_THRESHOLD", 0)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0}, raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+
+    def executor(*args, **kwargs):
+        raise AssertionError("a single CPU should be signed with in-process")
+
+    monkeypatch.setattr(signing, "ProcessPoolExecutor", executor)
+
+    # jobs=None means one job per CPU, i.e. just the one here.
+    sign_all_in_repodata(REG__REPODATA_SAMPLE_TEMP_FNAME, REG__PRIVATE_HEX, None)
+
+    repodata_signed = load_metadata_from_file(REG__REPODATA_SAMPLE_TEMP_FNAME)
+    assert set(repodata_signed["signatures"]) == {
+        *repodata_signed["packages"],
+        *repodata_signed["packages.conda"],
+    }
+
+
+@pytest.mark.parametrize(
+    "platform,jobs,expected",
+    [
+        ("linux", None, 8),
+        ("linux", 100, 100),
+        ("win32", None, 8),
+        ("win32", 100, 61),
+        ("win32", 61, 61),
+    ],
+)
+def test_resolve_signing_jobs(monkeypatch, platform, jobs, expected):
+    monkeypatch.setattr(signing.sys, "platform", platform)
+    monkeypatch.setattr(
+        os, "sched_getaffinity", lambda pid: set(range(8)), raising=False
+    )
+    assert signing._resolve_signing_jobs(jobs) == expected
+
+
+def test_sign_all_in_repodata_invalid_jobs():
+    with pytest.raises(ValueError):
+        sign_all_in_repodata(REG__REPODATA_SAMPLE_TEMP_FNAME, REG__PRIVATE_HEX, 0)
+
+
 def test_wrap_unserializable():
     with pytest.raises(TypeError):
         wrap_as_signable(object())